@@ -0,0 +1,35 @@
+"""add covering interval indexes
+
+Revision ID: 3c1d7e9a4f52
+Revises: bf0883b95827
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d7e9a4f52'
+down_revision: Union[str, None] = 'bf0883b95827'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Covering indexes let interval scans and the games-since counts of later
+    # games run as index-only scans on PostgreSQL
+    op.create_index('ix_crash_games_end_time_crash_point', 'crash_games', ['end_time'],
+                    unique=False, postgresql_include=['crash_point', 'game_id'])
+    op.create_index('ix_crash_games_game_id_covering', 'crash_games', ['game_id'],
+                    unique=False, postgresql_include=['end_time', 'crash_point'])
+    # end_time alone is now served by the covering index
+    op.drop_index('ix_crash_games_end_time', table_name='crash_games')
+
+
+def downgrade() -> None:
+    op.create_index('ix_crash_games_end_time', 'crash_games', ['end_time'], unique=False)
+    op.drop_index('ix_crash_games_game_id_covering', table_name='crash_games')
+    op.drop_index('ix_crash_games_end_time_crash_point', table_name='crash_games')
@@ -0,0 +1,34 @@
+"""add last game lookup indexes
+
+Revision ID: 8e2f4a6b1d93
+Revises: 3c1d7e9a4f52
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4a6b1d93'
+down_revision: Union[str, None] = '3c1d7e9a4f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes for "latest game matching a threshold or floor" lookups
+    op.create_index('ix_crash_games_crash_point_end_time', 'crash_games',
+                    ['crash_point', sa.text('end_time DESC')], unique=False)
+    op.create_index('ix_crash_games_crashed_floor_end_time', 'crash_games',
+                    ['crashed_floor', sa.text('end_time DESC')], unique=False)
+    # crash_point alone is now a prefix of the composite index
+    op.drop_index('ix_crash_games_crash_point', table_name='crash_games')
+
+
+def downgrade() -> None:
+    op.create_index('ix_crash_games_crash_point', 'crash_games', ['crash_point'], unique=False)
+    op.drop_index('ix_crash_games_crashed_floor_end_time', table_name='crash_games')
+    op.drop_index('ix_crash_games_crash_point_end_time', table_name='crash_games')
@@ -3,13 +3,19 @@ Interval analytics functions.
 
 This module contains functions for analyzing game data in time
 and game count intervals to identify patterns and occurrences.
+
+On PostgreSQL the time interval queries rely on the covering index
+ix_crash_games_end_time_crash_point and the game set queries on
+ix_crash_games_game_id_covering, so both can run as index-only scans.
 """
 
 import logging
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_
+from decimal import Decimal
+from sqlalchemy import desc, func, and_, case, cast, extract, BigInteger, Numeric
 
 from ...db.models import CrashGame
 
@@ -33,6 +39,359 @@ def ensure_timezone_aware(dt: datetime) -> datetime:
     return dt
 
 
+def _scale_to_full_set(matching_games: int, actual_games: int, games_per_set: int) -> int:
+    """
+    Extrapolate the matching count of a partially stored set to the full set size.
+
+    Rounds half up using integer arithmetic only, so counts never round-trip
+    through floats.
+
+    Args:
+        matching_games: Matching games among the stored games of the set
+        actual_games: Number of stored games in the set (must be > 0)
+        games_per_set: Full size of the set
+
+    Returns:
+        Matching games scaled to games_per_set
+    """
+    return (matching_games * games_per_set + actual_games // 2) // actual_games
+
+
+def _supports_sql_bucketing(session: Session) -> bool:
+    """
+    Check whether the session's database can bucket games by time itself.
+
+    Args:
+        session: SQLAlchemy session
+
+    Returns:
+        True if the bound database is PostgreSQL (which provides width_bucket)
+    """
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+def _to_naive_utc(dt: datetime) -> datetime:
+    """
+    Convert a datetime to a naive UTC datetime.
+
+    endTime is stored without timezone and read back as UTC, so bucket
+    origins and boundaries compared against it use the same convention.
+
+    Args:
+        dt: A naive (assumed UTC) or timezone-aware datetime
+
+    Returns:
+        A naive datetime in UTC
+    """
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _get_time_window(interval_minutes: int, hours: int) -> Tuple[datetime, datetime]:
+    """
+    Calculate the analysis window for the last N hours of time intervals.
+
+    The window starts on an interval boundary `hours` before the most recent
+    boundary and ends at the current time.
+
+    Args:
+        interval_minutes: Size of each interval in minutes
+        hours: Total hours to analyze
+
+    Returns:
+        Tuple of (start_time, analysis_end_time), both in UTC
+    """
+    # Calculate the end time in UTC
+    end_time = datetime.now(timezone.utc)
+
+    # Round the end time down to the nearest interval boundary
+    minutes = end_time.minute
+    floored_minutes = (minutes // interval_minutes) * interval_minutes
+
+    # Create a clean end time at the interval boundary
+    clean_end_time = end_time.replace(
+        minute=floored_minutes,
+        second=0,
+        microsecond=0
+    )
+
+    # Calculate the start time by going back the requested number of hours
+    # from the clean end time (keeping it on interval boundaries)
+    start_time = clean_end_time - timedelta(hours=hours)
+
+    # The actual end time for analysis (used for filtering games)
+    return start_time, end_time
+
+
+def _normalize_date_range(start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
+    """
+    Limit a date range to 7 days and widen it to whole days.
+
+    Args:
+        start_date: Start date for analysis
+        end_date: End date for analysis
+
+    Returns:
+        Tuple of (normalized_start_date, normalized_end_date) covering the
+        beginning of the first day to the end of the last day
+    """
+    # Limit the date range to a maximum of 7 days to prevent excessive processing
+    date_range_days = (end_date - start_date).days
+    if date_range_days > 7:
+        logger.warning(
+            f"Date range too large ({date_range_days} days). Limiting to 7 days.")
+        end_date = start_date + timedelta(days=7)
+
+    # Normalize start date to beginning of day
+    normalized_start_date = start_date.replace(
+        hour=0, minute=0, second=0, microsecond=0)
+
+    # Normalize end date to end of day
+    normalized_end_date = end_date.replace(
+        hour=23, minute=59, second=59, microsecond=999999)
+
+    return normalized_start_date, normalized_end_date
+
+
+def _count_matches_by_interval(
+    interval_indexes: np.ndarray,
+    crash_points: np.ndarray,
+    values: List[float],
+    num_intervals: int
+) -> np.ndarray:
+    """
+    Count crash points >= each value in every interval.
+
+    Each game gets a level equal to the number of thresholds it reaches, and
+    one bincount over (interval, level) pairs builds a histogram whose suffix
+    sums are the per-threshold counts. All thresholds are handled in a single
+    pass without a (values x games) comparison matrix.
+
+    Args:
+        interval_indexes: Interval index of each game
+        crash_points: Crash point of each game
+        values: Minimum crash point thresholds
+        num_intervals: Number of intervals
+
+    Returns:
+        Integer array of shape (len(values), num_intervals)
+    """
+    thresholds = np.asarray(values, dtype=np.float64)
+    order = np.argsort(thresholds, kind='stable')
+    num_levels = len(values) + 1
+
+    levels = np.searchsorted(thresholds[order], crash_points, side='right')
+    histogram = np.bincount(
+        interval_indexes * num_levels + levels,
+        minlength=num_intervals * num_levels
+    ).reshape(num_intervals, num_levels)
+
+    # A game reaches the j-th smallest threshold when its level is above j
+    reached = np.cumsum(histogram[:, ::-1], axis=1)[:, ::-1]
+
+    matches = np.empty((len(values), num_intervals), dtype=np.int64)
+    matches[order] = reached[:, 1:].T
+    return matches
+
+
+def _query_interval_counts(
+    session: Session,
+    values: List[float],
+    start_time: datetime,
+    end_time: datetime,
+    interval_minutes: int,
+    include_end: bool = True
+) -> List[Tuple[datetime, int, List[int]]]:
+    """
+    Count games per time interval for several thresholds with one aggregate query.
+
+    Games are bucketed with PostgreSQL's width_bucket over their epoch time,
+    which yields the interval number directly, and every threshold gets its
+    own COUNT(*) FILTER column, so the games in the window are scanned once
+    and only one row per non-empty interval is transferred.
+
+    Args:
+        session: SQLAlchemy session
+        values: Minimum crash point thresholds
+        start_time: Start of the first interval (inclusive)
+        end_time: End of the analyzed period
+        interval_minutes: Size of each interval in minutes
+        include_end: Whether games ending exactly at end_time are counted
+
+    Returns:
+        List of (interval_start, total_games, matching_games_per_value) tuples
+        for intervals that have games, ordered by interval_start
+    """
+    interval_delta = timedelta(minutes=interval_minutes)
+    origin = _to_naive_utc(start_time)
+    analysis_end = _to_naive_utc(end_time)
+    num_intervals = (end_time - start_time) // interval_delta + 1
+
+    # Bucket on exact numeric epoch seconds so games on a boundary are not
+    # misplaced by floating point rounding; naive times are UTC
+    origin_epoch = Decimal(
+        (origin - datetime(1970, 1, 1)) // timedelta(microseconds=1)) / 1_000_000
+    bucket = func.width_bucket(
+        cast(extract('epoch', CrashGame.endTime), Numeric),
+        origin_epoch,
+        origin_epoch + num_intervals * interval_minutes * 60,
+        num_intervals)
+    end_filter = CrashGame.endTime <= analysis_end if include_end \
+        else CrashGame.endTime < analysis_end
+    matching_columns = [
+        func.count().filter(CrashGame.crashPoint >= value)
+        .label(f'matching_{i}')
+        for i, value in enumerate(values)
+    ]
+
+    rows = session.query(
+        bucket.label('bucket'),
+        func.count().label('total_games'),
+        *matching_columns)\
+        .filter(CrashGame.endTime >= origin)\
+        .filter(end_filter)\
+        .group_by('bucket')\
+        .order_by('bucket')\
+        .all()
+
+    return [
+        (start_time + (row.bucket - 1) * interval_delta,
+         row.total_games, list(row[2:]))
+        for row in rows
+    ]
+
+
+def _count_intervals_in_memory(
+    session: Session,
+    values: List[float],
+    start_time: datetime,
+    end_time: datetime,
+    interval_minutes: int,
+    include_end: bool = True
+) -> List[Tuple[datetime, int, List[int]]]:
+    """
+    Count games per time interval for several thresholds in memory.
+
+    Fallback for databases without width_bucket. The games in the window are
+    fetched once into NumPy arrays and interval boundaries are located with
+    searchsorted.
+
+    Args:
+        session: SQLAlchemy session
+        values: Minimum crash point thresholds
+        start_time: Start of the first interval (inclusive)
+        end_time: End of the analyzed period
+        interval_minutes: Size of each interval in minutes
+        include_end: Whether games ending exactly at end_time are counted
+
+    Returns:
+        List of (interval_start, total_games, matching_games_per_value) tuples
+        for intervals that have games, ordered by interval_start
+    """
+    interval_delta = timedelta(minutes=interval_minutes)
+    window_start = _to_naive_utc(start_time)
+    window_end = _to_naive_utc(end_time)
+    end_filter = CrashGame.endTime <= window_end if include_end \
+        else CrashGame.endTime < window_end
+
+    # Stream the games in the time period (only the columns we need)
+    games = session.query(CrashGame.endTime, CrashGame.crashPoint)\
+        .filter(CrashGame.endTime >= window_start)\
+        .filter(end_filter)\
+        .order_by(CrashGame.endTime)\
+        .yield_per(5000)
+
+    # Fill the arrays straight from the stream without an intermediate list;
+    # times are compared as int64 microseconds (naive UTC)
+    game_data = np.fromiter(
+        ((_to_naive_utc(end), crash_point) for end, crash_point in games),
+        dtype=[('end_time', 'datetime64[us]'), ('crash_point', np.float64)])
+    end_times = game_data['end_time']
+    crash_points = game_data['crash_point']
+
+    if len(end_times) == 0:
+        return []
+
+    # Interval k covers [start_time + k * delta, start_time + (k + 1) * delta).
+    # Only the intervals between the first and last game can hold games
+    origin = np.datetime64(window_start, 'us')
+    step = np.timedelta64(interval_minutes, 'm')
+    first_interval = int((end_times[0] - origin) // step)
+    num_intervals = int((end_times[-1] - origin) // step) - first_interval + 1
+    edges = origin + (first_interval + np.arange(num_intervals + 1)) * step
+    boundaries = np.searchsorted(end_times, edges, side='left')
+    totals = np.diff(boundaries)
+
+    interval_indexes = np.repeat(np.arange(num_intervals), totals)
+    matches = _count_matches_by_interval(
+        interval_indexes, crash_points, values, num_intervals)
+
+    return [
+        (start_time + (first_interval + int(k)) * interval_delta,
+         int(totals[k]),
+         matches[:, k].tolist())
+        for k in np.flatnonzero(totals)
+    ]
+
+
+def _get_time_intervals(
+    session: Session,
+    values: List[float],
+    start_time: datetime,
+    end_time: datetime,
+    interval_minutes: int,
+    include_end: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Count occurrences of crash points >= each value in time intervals.
+
+    The counting runs in the database when it supports it and in memory
+    otherwise; either way the games in the window are read once for all
+    values.
+
+    Args:
+        session: SQLAlchemy session
+        values: Minimum crash point thresholds
+        start_time: Start of the first interval (inclusive)
+        end_time: End of the analyzed period
+        interval_minutes: Size of each interval in minutes
+        include_end: Whether games ending exactly at end_time are counted
+
+    Returns:
+        Dictionary mapping each value (as a string) to its interval
+        dictionaries for intervals that have games, ordered by interval_start
+    """
+    if _supports_sql_bucketing(session):
+        interval_counts = _query_interval_counts(
+            session, values, start_time, end_time, interval_minutes,
+            include_end)
+    else:
+        interval_counts = _count_intervals_in_memory(
+            session, values, start_time, end_time, interval_minutes,
+            include_end)
+
+    # Repeated values share a key, so each key is filled once from the
+    # counts of its value
+    value_indexes = {str(value): i for i, value in enumerate(values)}
+
+    interval_delta = timedelta(minutes=interval_minutes)
+    result = {key: [] for key in value_indexes}
+    for interval_start, total_games, matching_counts in interval_counts:
+        interval_end = interval_start + interval_delta
+        for key, value_index in value_indexes.items():
+            matching_games = matching_counts[value_index]
+            result[key].append({
+                'interval_start': interval_start,
+                'interval_end': interval_end,
+                'count': matching_games,
+                'total_games': total_games,
+                'percentage': (matching_games / total_games) * 100
+            })
+
+    return result
+
+
 def get_min_crash_point_intervals_by_time(
     session: Session,
     min_value: float,
@@ -57,80 +416,12 @@ def get_min_crash_point_intervals_by_time(
         - percentage: Percentage of games with crash point >= min_value
     """
     try:
-        # Calculate the end time in UTC
-        end_time = datetime.now(timezone.utc)
-
-        # Round the end time down to the nearest interval boundary
-        minutes = end_time.minute
-        floored_minutes = (minutes // interval_minutes) * interval_minutes
-
-        # Create a clean end time at the interval boundary
-        clean_end_time = end_time.replace(
-            minute=floored_minutes,
-            second=0,
-            microsecond=0
-        )
-
-        # The actual end time for analysis (used for filtering games)
-        analysis_end_time = end_time
-
-        # Calculate the clean interval end time for the last interval
-        # This is the next interval boundary after clean_end_time
-        last_interval_end = clean_end_time + \
-            timedelta(minutes=interval_minutes)
-
-        # Calculate the start time by going back the requested number of hours
-        # from the clean end time (keeping it on interval boundaries)
-        start_time = clean_end_time - timedelta(hours=hours)
-
-        interval_delta = timedelta(minutes=interval_minutes)
-
-        # Get all games in the time period
-        games = session.query(CrashGame)\
-            .filter(CrashGame.endTime >= start_time)\
-            .filter(CrashGame.endTime <= analysis_end_time)\
-            .order_by(CrashGame.endTime)\
-            .all()
+        start_time, analysis_end_time = _get_time_window(
+            interval_minutes, hours)
 
-        intervals = []
-        current_interval_start = start_time
-
-        # Process all intervals with standard boundaries
-        while current_interval_start < last_interval_end:
-            # Always use standard interval boundaries for all intervals
-            current_interval_end = current_interval_start + interval_delta
-
-            # Ensure timezone awareness for comparison
-            tz_aware_current_interval_start = ensure_timezone_aware(
-                current_interval_start)
-            tz_aware_current_interval_end = ensure_timezone_aware(
-                current_interval_end)
-            tz_aware_analysis_end_time = ensure_timezone_aware(
-                analysis_end_time)
-
-            # Count games in this interval
-            interval_games = [
-                g for g in games if tz_aware_current_interval_start <= ensure_timezone_aware(g.endTime) <
-                min(tz_aware_current_interval_end, tz_aware_analysis_end_time)]
-            total_games = len(interval_games)
-
-            # Count games with crash point >= min_value
-            matching_games = len(
-                [g for g in interval_games if g.crashPoint >= min_value])
-
-            # Only include intervals that have games
-            if total_games > 0:
-                intervals.append({
-                    'interval_start': current_interval_start,
-                    'interval_end': current_interval_end,
-                    'count': matching_games,
-                    'total_games': total_games,
-                    'percentage': (matching_games / total_games) * 100 if total_games > 0 else 0
-                })
-
-            current_interval_start = current_interval_end
-
-        return intervals
+        return _get_time_intervals(
+            session, [min_value], start_time, analysis_end_time,
+            interval_minutes, include_end=False)[str(min_value)]
 
     except Exception as e:
         logger.error(f"Error analyzing intervals by time: {str(e)}")
@@ -166,79 +457,15 @@ def get_min_crash_point_intervals_by_date_range(
         logger.info(f"Starting interval analysis by date range: min_value={min_value}, "
                     f"start_date={start_date}, end_date={end_date}, interval_minutes={interval_minutes}")
 
-        # Limit the date range to a maximum of 7 days to prevent excessive processing
-        date_range_days = (end_date - start_date).days
-        if date_range_days > 7:
-            logger.warning(
-                f"Date range too large ({date_range_days} days). Limiting to 7 days.")
-            end_date = start_date + timedelta(days=7)
-
-        # Normalize start date to beginning of day
-        normalized_start_date = start_date.replace(
-            hour=0, minute=0, second=0, microsecond=0)
-
-        # Normalize end date to end of day
-        normalized_end_date = end_date.replace(
-            hour=23, minute=59, second=59, microsecond=999999)
+        normalized_start_date, normalized_end_date = _normalize_date_range(
+            start_date, end_date)
 
         logger.info(
             f"Normalized date range: {normalized_start_date} to {normalized_end_date}")
 
-        # Calculate interval boundaries
-        interval_delta = timedelta(minutes=interval_minutes)
-
-        # Get all games in the date range with a single query
-        games = session.query(CrashGame)\
-            .filter(CrashGame.endTime >= normalized_start_date)\
-            .filter(CrashGame.endTime <= normalized_end_date)\
-            .order_by(CrashGame.endTime)\
-            .all()
-
-        logger.info(f"Retrieved {len(games)} games from the database")
-
-        # Process all intervals with in-memory data
-        intervals = []
-        current_interval_start = normalized_start_date
-
-        while current_interval_start <= normalized_end_date:
-            current_interval_end = current_interval_start + interval_delta
-
-            # Ensure timezone awareness for comparison
-            tz_aware_current_interval_start = ensure_timezone_aware(
-                current_interval_start)
-            tz_aware_current_interval_end = ensure_timezone_aware(
-                current_interval_end)
-
-            # Filter games in this interval using Python instead of database queries
-            interval_games = [
-                g for g in games
-                if tz_aware_current_interval_start <= ensure_timezone_aware(g.endTime) < tz_aware_current_interval_end
-            ]
-
-            total_games = len(interval_games)
-
-            # Only include intervals that have games
-            if total_games > 0:
-                # Count games with crash point >= min_value
-                matching_games = len(
-                    [g for g in interval_games if g.crashPoint >= min_value]
-                )
-
-                percentage = (matching_games / total_games) * 100
-
-                intervals.append({
-                    'interval_start': current_interval_start,
-                    'interval_end': current_interval_end,
-                    'count': matching_games,
-                    'total_games': total_games,
-                    'percentage': percentage
-                })
-
-            current_interval_start = current_interval_end
-
-            # Progress logging for long operations
-            if len(intervals) % 100 == 0 and len(intervals) > 0:
-                logger.info(f"Processed {len(intervals)} intervals so far")
+        intervals = _get_time_intervals(
+            session, [min_value], normalized_start_date, normalized_end_date,
+            interval_minutes)[str(min_value)]
 
         logger.info(
             f"Completed interval analysis: found {len(intervals)} intervals with game data")
@@ -277,7 +504,9 @@ def get_min_crash_point_intervals_by_game_sets(
                 valid_set_sizes, key=lambda x: abs(x-games_per_set))
 
         # Get the most recent games for analysis
-        games = session.query(CrashGame)\
+        games = session.query(
+            cast(CrashGame.gameId, BigInteger).label('gameId'),
+            CrashGame.endTime, CrashGame.crashPoint)\
             .order_by(desc(CrashGame.gameId))\
             .limit(total_games)\
             .all()
@@ -286,87 +515,65 @@ def get_min_crash_point_intervals_by_game_sets(
             return []
 
         # Determine the highest and lowest game IDs
-        highest_game_id = int(games[0].gameId)
-        lowest_game_id = int(games[-1].gameId)
-
-        # Helper function to calculate interval start ID for any game ID
-        def get_interval_start_id(game_id):
-            intervals_per_hundred = 100 // games_per_set
-            game_offset_in_hundred = game_id % 100
-            interval_index = game_offset_in_hundred // games_per_set
-            interval_start_offset = interval_index * games_per_set
-            return (game_id // 100) * 100 + interval_start_offset
-
-        # Calculate the interval boundaries for highest game
-        highest_interval_start = get_interval_start_id(highest_game_id)
-        highest_interval_end = highest_interval_start + games_per_set - 1
-
-        # Calculate the interval boundaries for lowest game
-        lowest_interval_start = get_interval_start_id(lowest_game_id)
-        lowest_interval_end = lowest_interval_start + games_per_set - 1
-
-        # Create a mapping of intervals to store games
-        game_intervals = {}
-
-        # Initialize the set counter
-        set_id = 1
-
-        # Create intervals from highest to lowest, ensuring we include both boundary games
-        current_interval_start = highest_interval_start
-
-        while current_interval_start >= lowest_interval_start:
-            interval_end = current_interval_start + games_per_set - 1
-            interval_key = f"{current_interval_start}-{interval_end}"
-
-            # Mark the current interval (containing highest_game_id) as in-progress
-            is_current_interval = (
-                highest_interval_start == current_interval_start)
-
-            game_intervals[interval_key] = {
-                'set_id': set_id,
-                'start_game': current_interval_start,
-                'end_game': interval_end,
-                'games': [],
-                'is_current_interval': is_current_interval
+        highest_game_id = games[0].gameId
+        lowest_game_id = games[-1].gameId
+
+        # Calculate the interval start for the highest and lowest games
+        highest_interval_start = highest_game_id - highest_game_id % games_per_set
+        lowest_interval_start = lowest_game_id - lowest_game_id % games_per_set
+
+        # Intervals in sequential order (from highest to lowest), indexed by set_id - 1.
+        # Sets tile every hundred exactly, so each one starts games_per_set IDs
+        # below the previous one
+        game_intervals = [
+            {
+                'set_id': set_index + 1,
+                'start_game': interval_start,
+                'end_game': interval_start + games_per_set - 1,
+                # Mark the current interval (containing highest_game_id) as in-progress
+                'is_current_interval': set_index == 0
             }
-
-            # Move to the previous interval
-            if current_interval_start % 100 >= games_per_set:
-                # Previous interval in the same hundred
-                current_interval_start -= games_per_set
+            for set_index, interval_start in enumerate(
+                range(highest_interval_start, lowest_interval_start - 1, -games_per_set))
+        ]
+
+        # Assign games to intervals by set index. Sets step down from the
+        # highest interval by games_per_set, so the index is plain arithmetic
+        game_ids = np.fromiter(
+            (g.gameId for g in games), dtype=np.int64, count=len(games))
+        set_indexes = (highest_interval_start -
+                       (game_ids - game_ids % games_per_set)) // games_per_set
+        # Game IDs are strings, so the most recent games are fetched in text
+        # order; games outside the highest..lowest range are skipped
+        in_range = (set_indexes >= 0) & (set_indexes < len(game_intervals))
+        interval_games_by_set = [[] for _ in range(len(game_intervals))]
+        for game, set_index, is_in_range in zip(
+                games, set_indexes.tolist(), in_range.tolist()):
+            if is_in_range:
+                interval_games_by_set[set_index].append(game)
+
+        # Count matching games for every set at once
+        crash_points = np.fromiter(
+            (g.crashPoint for g in games), dtype=np.float64, count=len(games))
+        matching_by_set = np.bincount(
+            set_indexes[in_range & (crash_points >= min_crash_point)],
+            minlength=len(game_intervals))
+
+        # Get the time range of each set once; the first and last game by
+        # time are simply the earliest and latest end times
+        set_time_ranges = []
+        for set_games in interval_games_by_set:
+            if set_games:
+                end_times = [ensure_timezone_aware(g.endTime) for g in set_games]
+                set_time_ranges.append((min(end_times), max(end_times)))
             else:
-                # Last interval in the previous hundred
-                intervals_per_hundred = 100 // games_per_set
-                last_interval_offset = (
-                    (intervals_per_hundred - 1) * games_per_set)
-                current_interval_start = (
-                    (current_interval_start // 100) - 1) * 100 + last_interval_offset
-
-            set_id += 1
-
-        # Assign games to intervals
-        for game in games:
-            game_id = int(game.gameId)
-            interval_start = get_interval_start_id(game_id)
-            interval_end = interval_start + games_per_set - 1
-            interval_key = f"{interval_start}-{interval_end}"
-
-            if interval_key in game_intervals:
-                game_intervals[interval_key]['games'].append(game)
+                set_time_ranges.append(None)
 
         # Find the earliest and latest times for reference (for intervals with no games)
-        earliest_time = None
-        latest_time = None
-        for interval_data in game_intervals.values():
-            if interval_data['games']:
-                interval_games = sorted(
-                    interval_data['games'], key=lambda g: ensure_timezone_aware(g.endTime))
-                if earliest_time is None or ensure_timezone_aware(interval_games[0].endTime) < earliest_time:
-                    earliest_time = ensure_timezone_aware(
-                        interval_games[0].endTime)
-                if latest_time is None or ensure_timezone_aware(interval_games[-1].endTime) > latest_time:
-                    latest_time = ensure_timezone_aware(
-                        interval_games[-1].endTime)
+        earliest_time = min(
+            (time_range[0] for time_range in set_time_ranges if time_range), default=None)
+        latest_time = max(
+            (time_range[1] for time_range in set_time_ranges if time_range), default=None)
 
         # If we couldn't find any time reference, use current time
         if earliest_time is None:
@@ -376,15 +583,11 @@ def get_min_crash_point_intervals_by_game_sets(
         # Create result intervals in sequential order (from highest to lowest)
         result = []
 
-        # Sort intervals by set_id (which is sequential from highest to lowest)
-        sorted_intervals = sorted(
-            game_intervals.items(), key=lambda x: x[1]['set_id'])
-
-        for interval_key, interval_data in sorted_intervals:
+        for interval_data, interval_games, time_range, set_matches in zip(
+                game_intervals, interval_games_by_set, set_time_ranges,
+                matching_by_set.tolist()):
             # Calculate statistics for this interval
-            interval_games = interval_data['games']
-            matching_games = len(
-                [g for g in interval_games if g.crashPoint >= min_crash_point])
+            matching_games = set_matches
 
             # For completed intervals, total_games should be the full interval size
             # For the current (most recent) interval, use actual count from the database
@@ -398,16 +601,12 @@ def get_min_crash_point_intervals_by_game_sets(
                 actual_games = len(interval_games)
                 if actual_games > 0:
                     # Extrapolate the matching games to full interval size
-                    matching_percentage = matching_games / actual_games
-                    matching_games = round(matching_percentage * games_per_set)
+                    matching_games = _scale_to_full_set(
+                        matching_games, actual_games, games_per_set)
 
             # Get the start and end times from the games in this interval
-            if interval_games:
-                # Sort games by time for time range calculation
-                interval_games = sorted(
-                    interval_games, key=lambda g: ensure_timezone_aware(g.endTime))
-                start_time = ensure_timezone_aware(interval_games[0].endTime)
-                end_time = ensure_timezone_aware(interval_games[-1].endTime)
+            if time_range:
+                start_time, end_time = time_range
             else:
                 # For intervals with no games, use estimated times
                 time_diff = latest_time - earliest_time
@@ -432,7 +631,7 @@ def get_min_crash_point_intervals_by_game_sets(
                 'end_game': interval_data['end_game'],
                 'count': matching_games,
                 'total_games': total_interval_games,
-                'percentage': (matching_games / total_interval_games) * 100 if total_interval_games > 0 else 0,
+                'percentage': (matching_games / total_interval_games) * 100,
                 'is_current_interval': interval_data['is_current_interval'],
                 'actual_games': len(interval_games)  # For debugging
             })
@@ -464,16 +663,13 @@ def get_min_crash_point_intervals_by_time_batch(
         Dictionary mapping each value to its corresponding interval data
     """
     try:
-        # Process each value
-        result = {}
-        for value in values:
-            # Get intervals for this value
-            intervals = get_min_crash_point_intervals_by_time(
-                session, value, interval_minutes, hours)
-            # Add to result
-            result[str(value)] = intervals
+        start_time, analysis_end_time = _get_time_window(
+            interval_minutes, hours)
 
-        return result
+        # Count all values in a single pass over the games
+        return _get_time_intervals(
+            session, values, start_time, analysis_end_time,
+            interval_minutes, include_end=False)
 
     except Exception as e:
         logger.error(
@@ -505,22 +701,13 @@ def get_min_crash_point_intervals_by_date_range_batch(
         logger.info(
             f"Starting batch interval analysis for {len(values)} values")
 
-        # Limit the date range to a maximum of 7 days to prevent excessive processing
-        date_range_days = (end_date - start_date).days
-        if date_range_days > 7:
-            logger.warning(
-                f"Date range too large ({date_range_days} days). Limiting to 7 days.")
-            end_date = start_date + timedelta(days=7)
+        normalized_start_date, normalized_end_date = _normalize_date_range(
+            start_date, end_date)
 
-        # Process each value
-        result = {}
-        for i, value in enumerate(values):
-            logger.info(f"Processing value {i+1}/{len(values)}: {value}")
-            # Get intervals for this value
-            intervals = get_min_crash_point_intervals_by_date_range(
-                session, value, start_date, end_date, interval_minutes)
-            # Add to result
-            result[str(value)] = intervals
+        # Count all values in a single pass over the games
+        result = _get_time_intervals(
+            session, values, normalized_start_date, normalized_end_date,
+            interval_minutes)
 
         logger.info(
             f"Completed batch interval analysis for {len(values)} values")
@@ -560,159 +747,138 @@ def get_min_crash_point_intervals_by_game_sets_batch(
             games_per_set = min(
                 valid_set_sizes, key=lambda x: abs(x-games_per_set))
 
-        # Get the games once for all values to avoid multiple queries
-        games = session.query(CrashGame)\
+        # Aggregate the most recent games per set in the database, with one
+        # matching count column per value; a set is keyed by its first game ID
+        game_id = cast(CrashGame.gameId, BigInteger)
+        recent_games = session.query(
+            game_id.label('game_id'),
+            CrashGame.gameId.label('game_key'),
+            CrashGame.endTime.label('end_time'),
+            CrashGame.crashPoint.label('crash_point'))\
             .order_by(desc(CrashGame.gameId))\
             .limit(total_games)\
+            .subquery()
+
+        set_start = recent_games.c.game_id - \
+            recent_games.c.game_id % games_per_set
+        matching_columns = [
+            func.sum(case((recent_games.c.crash_point >= value, 1), else_=0))
+            .label(f'matching_{i}')
+            for i, value in enumerate(values)
+        ]
+        set_rows = session.query(
+            set_start.label('set_start'),
+            func.min(recent_games.c.end_time).label('start_time'),
+            func.max(recent_games.c.end_time).label('end_time'),
+            func.count().label('actual_games'),
+            func.max(recent_games.c.game_key).label('highest_game_key'),
+            func.min(recent_games.c.game_key).label('lowest_game_key'),
+            *matching_columns)\
+            .group_by('set_start')\
             .all()
 
-        if not games:
+        if not set_rows:
             return {str(value): [] for value in values}
 
-        # Determine the highest and lowest game IDs
-        highest_game_id = int(games[0].gameId)
-        lowest_game_id = int(games[-1].gameId)
-
-        # Helper function to calculate interval start ID for any game ID
-        def get_interval_start_id(game_id):
-            intervals_per_hundred = 100 // games_per_set
-            game_offset_in_hundred = game_id % 100
-            interval_index = game_offset_in_hundred // games_per_set
-            interval_start_offset = interval_index * games_per_set
-            return (game_id // 100) * 100 + interval_start_offset
-
-        # Calculate the interval boundaries for highest game
-        highest_interval_start = get_interval_start_id(highest_game_id)
-        highest_interval_end = highest_interval_start + games_per_set - 1
-
-        # Calculate the interval boundaries for lowest game
-        lowest_interval_start = get_interval_start_id(lowest_game_id)
-        lowest_interval_end = lowest_interval_start + games_per_set - 1
-
-        # Create a mapping of intervals to store games
-        game_intervals = {}
-
-        # Initialize the set counter
-        set_id = 1
-
-        # Create intervals from highest to lowest, ensuring we include both boundary games
-        current_interval_start = highest_interval_start
-
-        while current_interval_start >= lowest_interval_start:
-            interval_end = current_interval_start + games_per_set - 1
-            interval_key = f"{current_interval_start}-{interval_end}"
-
-            # Mark the current interval (containing highest_game_id) as in-progress
-            is_current_interval = (
-                highest_interval_start == current_interval_start)
-
-            game_intervals[interval_key] = {
-                'set_id': set_id,
-                'start_game': current_interval_start,
-                'end_game': interval_end,
-                'games': [],
-                'is_current_interval': is_current_interval
-            }
+        # Determine the highest and lowest game IDs in the same text order
+        # the most recent games were fetched in
+        highest_game_id = int(max(row.highest_game_key for row in set_rows))
+        lowest_game_id = int(min(row.lowest_game_key for row in set_rows))
+
+        # Calculate the interval start for the highest and lowest games
+        highest_interval_start = highest_game_id - highest_game_id % games_per_set
+        lowest_interval_start = lowest_game_id - lowest_game_id % games_per_set
+
+        # Sets outside the highest..lowest range are skipped, as in
+        # get_min_crash_point_intervals_by_game_sets
+        set_rows = [
+            row for row in set_rows
+            if lowest_interval_start <= row.set_start <= highest_interval_start
+        ]
+        if not set_rows:
+            return {str(value): [] for value in values}
 
-            # Move to the previous interval
-            if current_interval_start % 100 >= games_per_set:
-                # Previous interval in the same hundred
-                current_interval_start -= games_per_set
-            else:
-                # Last interval in the previous hundred
-                intervals_per_hundred = 100 // games_per_set
-                last_interval_offset = (
-                    (intervals_per_hundred - 1) * games_per_set)
-                current_interval_start = (
-                    (current_interval_start // 100) - 1) * 100 + last_interval_offset
+        set_rows_by_start = {row.set_start: row for row in set_rows}
+
+        # Intervals in sequential order (from highest to lowest), indexed by set_id - 1.
+        # Sets tile every hundred exactly, so each one starts games_per_set IDs
+        # below the previous one
+        game_intervals = [
+            {
+                'set_id': set_index + 1,
+                'start_game': interval_start,
+                'end_game': interval_start + games_per_set - 1,
+                # Mark the current interval (containing highest_game_id) as in-progress
+                'is_current_interval': set_index == 0
+            }
+            for set_index, interval_start in enumerate(
+                range(highest_interval_start, lowest_interval_start - 1, -games_per_set))
+        ]
 
-            set_id += 1
+        # Find the earliest and latest times for reference (for intervals with no games)
+        earliest_time = ensure_timezone_aware(
+            min(row.start_time for row in set_rows))
+        latest_time = ensure_timezone_aware(
+            max(row.end_time for row in set_rows))
 
-        # Assign games to intervals
-        for game in games:
-            game_id = int(game.gameId)
-            interval_start = get_interval_start_id(game_id)
-            interval_end = interval_start + games_per_set - 1
-            interval_key = f"{interval_start}-{interval_end}"
+        num_intervals = len(game_intervals)
+        no_matches = [0] * len(values)
 
-            if interval_key in game_intervals:
-                game_intervals[interval_key]['games'].append(game)
+        # Summarize each interval once with the counts for every value
+        interval_summaries = []
+        for interval_data in game_intervals:
+            set_row = set_rows_by_start.get(interval_data['start_game'])
 
-        # Find the earliest and latest times for reference (for intervals with no games)
-        earliest_time = None
-        latest_time = None
-        for interval_data in game_intervals.values():
-            if interval_data['games']:
-                interval_games = sorted(
-                    interval_data['games'], key=lambda g: ensure_timezone_aware(g.endTime))
-                if earliest_time is None or ensure_timezone_aware(interval_games[0].endTime) < earliest_time:
-                    earliest_time = ensure_timezone_aware(
-                        interval_games[0].endTime)
-                if latest_time is None or ensure_timezone_aware(interval_games[-1].endTime) > latest_time:
-                    latest_time = ensure_timezone_aware(
-                        interval_games[-1].endTime)
+            if set_row is not None:
+                # Get the start and end times from the games in this interval
+                start_time = ensure_timezone_aware(set_row.start_time)
+                end_time = ensure_timezone_aware(set_row.end_time)
+                actual_games = set_row.actual_games
+                matching_counts = list(set_row[6:])
+            else:
+                actual_games = 0
+                matching_counts = no_matches
 
-        # If we couldn't find any time reference, use current time
-        if earliest_time is None:
-            earliest_time = datetime.now()
-            latest_time = earliest_time
+                # For intervals with no games, use estimated times
+                time_diff = latest_time - earliest_time
+                if num_intervals > 1:
+                    relative_position = (
+                        interval_data['set_id'] - 1) / (num_intervals - 1)
+                    estimated_time = latest_time - \
+                        (time_diff * relative_position)
+                    # Offset slightly for start/end
+                    start_time = estimated_time - timedelta(minutes=1)
+                    end_time = estimated_time
+                else:
+                    start_time = earliest_time
+                    end_time = latest_time
 
-        # Sort intervals by set_id (which is sequential from highest to lowest)
-        sorted_intervals = sorted(
-            game_intervals.items(), key=lambda x: x[1]['set_id'])
-        num_intervals = len(game_intervals)
+            interval_summaries.append(
+                (interval_data, start_time, end_time, actual_games, matching_counts))
 
         # Process each value to calculate intervals
         result = {}
-        for value in values:
+        for value_index, value in enumerate(values):
             value_intervals = []
 
             # Create result intervals in sequential order (from highest to lowest)
-            for interval_key, interval_data in sorted_intervals:
+            for interval_data, start_time, end_time, actual_games, matching_counts in interval_summaries:
                 # Calculate statistics for this interval and value
-                interval_games = interval_data['games']
-                matching_games = len(
-                    [g for g in interval_games if g.crashPoint >= value])
+                matching_games = int(matching_counts[value_index])
 
                 # For completed intervals, total_games should be the full interval size
                 # For the current (most recent) interval, use actual count from the database
                 if interval_data['is_current_interval']:
-                    total_interval_games = len(interval_games)
+                    total_interval_games = actual_games
                 else:
                     # For past intervals that should be complete, use the full interval size
                     total_interval_games = games_per_set
 
                     # Calculate the adjusted matching_games based on percentage from actual data
-                    actual_games = len(interval_games)
                     if actual_games > 0:
                         # Extrapolate the matching games to full interval size
-                        matching_percentage = matching_games / actual_games
-                        matching_games = round(
-                            matching_percentage * games_per_set)
-
-                # Get the start and end times from the games in this interval
-                if interval_games:
-                    # Sort games by time for time range calculation
-                    interval_games = sorted(
-                        interval_games, key=lambda g: ensure_timezone_aware(g.endTime))
-                    start_time = ensure_timezone_aware(
-                        interval_games[0].endTime)
-                    end_time = ensure_timezone_aware(
-                        interval_games[-1].endTime)
-                else:
-                    # For intervals with no games, use estimated times
-                    time_diff = latest_time - earliest_time
-                    if num_intervals > 1:
-                        relative_position = (
-                            interval_data['set_id'] - 1) / (num_intervals - 1)
-                        estimated_time = latest_time - \
-                            (time_diff * relative_position)
-                        # Offset slightly for start/end
-                        start_time = estimated_time - timedelta(minutes=1)
-                        end_time = estimated_time
-                    else:
-                        start_time = earliest_time
-                        end_time = latest_time
+                        matching_games = _scale_to_full_set(
+                            matching_games, actual_games, games_per_set)
 
                 value_intervals.append({
                     'set_id': interval_data['set_id'],
@@ -722,9 +888,9 @@ def get_min_crash_point_intervals_by_game_sets_batch(
                     'end_game': interval_data['end_game'],
                     'count': matching_games,
                     'total_games': total_interval_games,
-                    'percentage': (matching_games / total_interval_games) * 100 if total_interval_games > 0 else 0,
+                    'percentage': (matching_games / total_interval_games) * 100,
                     'is_current_interval': interval_data['is_current_interval'],
-                    'actual_games': len(interval_games)  # For debugging
+                    'actual_games': actual_games  # For debugging
                 })
 
             # Add to result dictionary
@@ -6,9 +6,10 @@ with specific crash point criteria.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import desc, func, literal, select, union_all
 import math
 
 from ...db.models import CrashGame
@@ -17,6 +18,48 @@ from ...db.models import CrashGame
 logger = logging.getLogger(__name__)
 
 
+# Columns needed to build a game dictionary; loading them as plain rows
+# skips ORM instance construction and identity map bookkeeping
+_GAME_COLUMNS = (
+    CrashGame.gameId,
+    CrashGame.hashValue,
+    CrashGame.crashPoint,
+    CrashGame.calculatedPoint,
+    CrashGame.crashedFloor,
+    CrashGame.endTime,
+    CrashGame.prepareTime,
+    CrashGame.beginTime,
+)
+
+
+def _game_row_to_dict(row: Any) -> Dict[str, Any]:
+    """
+    Convert a row of _GAME_COLUMNS to the same dictionary as CrashGame.to_dict().
+
+    Args:
+        row: Result row with CrashGame's attribute names
+
+    Returns:
+        Dictionary with ISO formatted datetime strings
+    """
+    return CrashGame.values_to_dict(row._mapping)
+
+
+def _games_since_column() -> Any:
+    """
+    Build a column counting the games that ended after each selected game.
+
+    Returns:
+        Correlated scalar subquery labeled games_since
+    """
+    later_game = aliased(CrashGame)
+    return select(func.count(later_game.gameId))\
+        .where(later_game.endTime > CrashGame.endTime)\
+        .scalar_subquery()\
+        .label('games_since')
+
+
+@lru_cache(maxsize=4096)
 def calculate_crash_probability(crash_point: float, games_since: int = 0) -> float:
     """
     Calculate the cumulative probability of a crash point occurring on the next game,
@@ -54,6 +97,166 @@ def calculate_crash_probability(crash_point: float, games_since: int = 0) -> flo
         return 0.0
 
 
+def _find_last_matching_games(session: Session, conditions: List[Any]) -> List[Optional[Tuple[Any, int]]]:
+    """
+    Find the most recent game matching each condition, with the count of games since it.
+
+    Every condition becomes an ORDER BY end_time DESC LIMIT 1 subquery that
+    also counts the later games, and the subqueries are combined with
+    UNION ALL so all lookups take a single round trip.
+
+    Args:
+        session: SQLAlchemy session
+        conditions: Filter expressions on CrashGame, one per lookup
+
+    Returns:
+        List aligned with conditions holding (game_row, games_since) for each
+        condition that matched a game, or None otherwise
+    """
+    if not conditions:
+        return []
+
+    # Label the columns with their attribute names so the rows still format
+    # through CrashGame.values_to_dict after passing through the subqueries
+    game_columns = [column.label(column.key) for column in _GAME_COLUMNS]
+
+    lookups = []
+    for index, condition in enumerate(conditions):
+        last_match = select(
+            *game_columns,
+            _games_since_column(),
+            literal(index).label('condition_index'))\
+            .where(condition)\
+            .order_by(desc(CrashGame.endTime))\
+            .limit(1)\
+            .subquery()
+        lookups.append(select(last_match))
+
+    matches = [None] * len(conditions)
+    for row in session.execute(union_all(*lookups)):
+        matches[row.condition_index] = (row, row.games_since)
+
+    return matches
+
+
+def _game_result(
+    game: Any,
+    games_since: int,
+    value: float,
+    calculate_probability: Optional[Callable[[float, int], float]] = None
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Build the (game_dict, games_since) result for a matched game.
+
+    Args:
+        game: Result row with CrashGame's attribute names
+        games_since: Number of games since this game
+        value: Threshold the game was matched against
+        calculate_probability: Optional probability function of (value, games_since)
+
+    Returns:
+        Tuple of (game_dict, games_since), with probability information
+        added to game_dict when calculate_probability is given
+    """
+    game_dict = _game_row_to_dict(game)
+
+    if calculate_probability is not None:
+        # Add probability information
+        game_dict['probability'] = {
+            'value': calculate_probability(value, games_since),
+            'games_since': games_since
+        }
+
+    return game_dict, games_since
+
+
+def _last_games(session: Session, condition: Any, limit: int) -> List[Dict[str, Any]]:
+    """
+    Get the most recent games matching a condition.
+
+    Args:
+        session: SQLAlchemy session
+        condition: Filter expression on CrashGame
+        limit: Maximum number of games to return
+
+    Returns:
+        List of dictionaries containing game data for matching games
+    """
+    games = session.query(*_GAME_COLUMNS)\
+        .filter(condition)\
+        .order_by(desc(CrashGame.endTime))\
+        .limit(limit)\
+        .all()
+
+    # Convert games to dictionaries
+    return [_game_row_to_dict(game) for game in games]
+
+
+def _last_game(
+    session: Session,
+    condition: Any,
+    value: float,
+    calculate_probability: Optional[Callable[[float, int], float]] = None
+) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Get the most recent game matching a condition and the count of games since it.
+
+    The game and its games_since count are fetched in a single statement.
+
+    Args:
+        session: SQLAlchemy session
+        condition: Filter expression on CrashGame
+        value: Threshold the condition tests
+        calculate_probability: Optional probability function of (value, games_since)
+
+    Returns:
+        Tuple of (game_dict, games_since_count) if found, None otherwise
+    """
+    game = session.query(*_GAME_COLUMNS, _games_since_column())\
+        .filter(condition)\
+        .order_by(desc(CrashGame.endTime))\
+        .first()
+
+    if game:
+        return _game_result(game, game.games_since, value, calculate_probability)
+
+    return None
+
+
+def _last_games_by_value(
+    session: Session,
+    values: List[float],
+    condition_for: Callable[[float], Any],
+    calculate_probability: Optional[Callable[[float, int], float]] = None
+) -> Dict[float, Optional[Tuple[Dict[str, Any], int]]]:
+    """
+    Get the most recent game matching the condition built for each value.
+
+    Args:
+        session: SQLAlchemy session
+        values: Threshold values to search for
+        condition_for: Builds the filter expression on CrashGame for a value
+        calculate_probability: Optional probability function of (value, games_since)
+
+    Returns:
+        Dictionary mapping each value to its result tuple (game_dict, games_since_count)
+        if found, or None if no matching game was found
+    """
+    matches = _find_last_matching_games(
+        session, [condition_for(value) for value in values])
+
+    results = {}
+    for value, match in zip(values, matches):
+        if match:
+            game, games_since = match
+            results[value] = _game_result(
+                game, games_since, value, calculate_probability)
+        else:
+            results[value] = None
+
+    return results
+
+
 def get_last_min_crash_point_games(session: Session, min_value: float, limit: int = 10) -> List[Dict[str, Any]]:
     """
     Get the most recent games with crash points greater than or equal to the specified value.
@@ -68,14 +271,7 @@ def get_last_min_crash_point_games(session: Session, min_value: float, limit: in
     """
     try:
         # Query the most recent games with crash point >= min_value
-        games = session.query(CrashGame)\
-            .filter(CrashGame.crashPoint >= min_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .limit(limit)\
-            .all()
-
-        # Convert games to dictionaries
-        return [game.to_dict() for game in games]
+        return _last_games(session, CrashGame.crashPoint >= min_value, limit)
 
     except Exception as e:
         logger.error(
@@ -97,14 +293,7 @@ def get_last_max_crash_point_games(session: Session, max_value: float, limit: in
     """
     try:
         # Query the most recent games with crash point <= max_value
-        games = session.query(CrashGame)\
-            .filter(CrashGame.crashPoint <= max_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .limit(limit)\
-            .all()
-
-        # Convert games to dictionaries
-        return [game.to_dict() for game in games]
+        return _last_games(session, CrashGame.crashPoint <= max_value, limit)
 
     except Exception as e:
         logger.error(
@@ -126,14 +315,7 @@ def get_last_exact_floor_games(session: Session, floor_value: int, limit: int =
     """
     try:
         # Query the most recent games with floor matching exactly
-        games = session.query(CrashGame)\
-            .filter(CrashGame.crashedFloor == floor_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .limit(limit)\
-            .all()
-
-        # Convert games to dictionaries
-        return [game.to_dict() for game in games]
+        return _last_games(session, CrashGame.crashedFloor == floor_value, limit)
 
     except Exception as e:
         logger.error(
@@ -157,33 +339,9 @@ def get_last_game_min_crash_point(session: Session, min_value: float) -> Optiona
     """
     try:
         # Query the most recent game with crash point >= min_value
-        game = session.query(CrashGame)\
-            .filter(CrashGame.crashPoint >= min_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        if game:
-            # Get the latest game's ID to calculate games since
-            latest_game = session.query(CrashGame)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            # Count games between the found game and the latest game
-            games_since = session.query(func.count(CrashGame.gameId))\
-                .filter(CrashGame.endTime > game.endTime)\
-                .scalar()
-
-            game_dict = game.to_dict()
-
-            # Add probability information
-            game_dict['probability'] = {
-                'value': calculate_crash_probability(min_value, games_since),
-                'games_since': games_since
-            }
-
-            return game_dict, games_since
-
-        return None
+        return _last_game(
+            session, CrashGame.crashPoint >= min_value, min_value,
+            calculate_crash_probability)
 
     except Exception as e:
         logger.error(
@@ -207,29 +365,9 @@ def get_last_game_exact_floor(session: Session, floor_value: int) -> Optional[Tu
     """
     try:
         # Query the most recent game with crashed floor exact match
-        game = session.query(CrashGame)\
-            .filter(CrashGame.crashedFloor == floor_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        if game:
-            # Get the latest game's ID to calculate games since
-            latest_game = session.query(CrashGame)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            # Count games between the found game and the latest game
-            games_since = session.query(func.count(CrashGame.gameId))\
-                .filter(CrashGame.endTime > game.endTime)\
-                .scalar()
-
-            game_dict = game.to_dict()
-
-            # Removed probability calculation for exact floors
-
-            return game_dict, games_since
-
-        return None
+        # (no probability calculation for exact floors)
+        return _last_game(
+            session, CrashGame.crashedFloor == floor_value, floor_value)
 
     except Exception as e:
         logger.error(
@@ -250,37 +388,10 @@ def get_last_games_min_crash_points(session: Session, values: List[float]) -> Di
         or None if no matching game was found
     """
     try:
-        results = {}
-        latest_game = session.query(CrashGame)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        for value in values:
-            # Query the most recent game with crash point >= value
-            game = session.query(CrashGame)\
-                .filter(CrashGame.crashPoint >= value)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            if game:
-                # Count games between the found game and the latest game
-                games_since = session.query(func.count(CrashGame.gameId))\
-                    .filter(CrashGame.endTime > game.endTime)\
-                    .scalar()
-
-                game_dict = game.to_dict()
-
-                # Add probability information
-                game_dict['probability'] = {
-                    'value': calculate_crash_probability(value, games_since),
-                    'games_since': games_since
-                }
-
-                results[value] = (game_dict, games_since)
-            else:
-                results[value] = None
-
-        return results
+        # Find the most recent game with crash point >= value for every value at once
+        return _last_games_by_value(
+            session, values, lambda value: CrashGame.crashPoint >= value,
+            calculate_crash_probability)
 
     except Exception as e:
         logger.error(
@@ -301,33 +412,10 @@ def get_last_games_exact_floors(session: Session, values: List[int]) -> Dict[int
         or None if no matching game was found
     """
     try:
-        results = {}
-        latest_game = session.query(CrashGame)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        for value in values:
-            # Query the most recent game with exact floor
-            game = session.query(CrashGame)\
-                .filter(CrashGame.crashedFloor == value)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            if game:
-                # Count games between the found game and the latest game
-                games_since = session.query(func.count(CrashGame.gameId))\
-                    .filter(CrashGame.endTime > game.endTime)\
-                    .scalar()
-
-                game_dict = game.to_dict()
-
-                # No longer add probability information for exact floors
-
-                results[value] = (game_dict, games_since)
-            else:
-                results[value] = None
-
-        return results
+        # Find the most recent game with each exact floor at once
+        # (no probability information for exact floors)
+        return _last_games_by_value(
+            session, values, lambda value: CrashGame.crashedFloor == value)
 
     except Exception as e:
         logger.error(
@@ -351,33 +439,9 @@ def get_last_game_max_crash_point(session: Session, max_value: float) -> Optiona
     """
     try:
         # Query the most recent game with crash point <= max_value
-        game = session.query(CrashGame)\
-            .filter(CrashGame.crashPoint <= max_value)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        if game:
-            # Get the latest game's ID to calculate games since
-            latest_game = session.query(CrashGame)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            # Count games between the found game and the latest game
-            games_since = session.query(func.count(CrashGame.gameId))\
-                .filter(CrashGame.endTime > game.endTime)\
-                .scalar()
-
-            game_dict = game.to_dict()
-
-            # Add probability information using max crash probability calculation
-            game_dict['probability'] = {
-                'value': calculate_max_crash_probability(max_value, games_since),
-                'games_since': games_since
-            }
-
-            return game_dict, games_since
-
-        return None
+        return _last_game(
+            session, CrashGame.crashPoint <= max_value, max_value,
+            calculate_max_crash_probability)
 
     except Exception as e:
         logger.error(
@@ -398,37 +462,10 @@ def get_last_games_max_crash_points(session: Session, values: List[float]) -> Di
         or None if no matching game was found
     """
     try:
-        results = {}
-        latest_game = session.query(CrashGame)\
-            .order_by(desc(CrashGame.endTime))\
-            .first()
-
-        for value in values:
-            # Query the most recent game with crash point <= value
-            game = session.query(CrashGame)\
-                .filter(CrashGame.crashPoint <= value)\
-                .order_by(desc(CrashGame.endTime))\
-                .first()
-
-            if game:
-                # Count games between the found game and the latest game
-                games_since = session.query(func.count(CrashGame.gameId))\
-                    .filter(CrashGame.endTime > game.endTime)\
-                    .scalar()
-
-                game_dict = game.to_dict()
-
-                # Add probability information
-                game_dict['probability'] = {
-                    'value': calculate_max_crash_probability(value, games_since),
-                    'games_since': games_since
-                }
-
-                results[value] = (game_dict, games_since)
-            else:
-                results[value] = None
-
-        return results
+        # Find the most recent game with crash point <= value for every value at once
+        return _last_games_by_value(
+            session, values, lambda value: CrashGame.crashPoint <= value,
+            calculate_max_crash_probability)
 
     except Exception as e:
         logger.error(
@@ -436,6 +473,7 @@ def get_last_games_max_crash_points(session: Session, values: List[float]) -> Di
         raise
 
 
+@lru_cache(maxsize=4096)
 def calculate_max_crash_probability(max_value: float, games_since: int = 0) -> float:
     """
     Calculate a simple probability estimate for a max crash point.
@@ -5,9 +5,10 @@ This module defines the database models used by the application, specifically
 the CrashGame model for storing game results from Crash.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, desc
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
+from typing import Any, Dict, Mapping
 import pytz
 
 from .. import config
@@ -43,20 +44,47 @@ class CrashGame(Base):
 
     # Add indexes for commonly queried fields
     __table_args__ = (
-        Index('ix_crash_games_crash_point', 'crash_point'),
+        # Serve "latest game matching a threshold or floor" lookups; the
+        # crash point index also covers plain crash_point filters
+        Index('ix_crash_games_crash_point_end_time',
+              'crash_point', desc('end_time')),
+        Index('ix_crash_games_crashed_floor_end_time',
+              'crashed_floor', desc('end_time')),
         Index('ix_crash_games_begin_time', 'begin_time'),
-        Index('ix_crash_games_end_time', 'end_time'),
+        # Covering indexes so interval scans can be answered from the index
+        # alone; the end_time one also serves plain end_time lookups and
+        # carries game_id for the games-since counts of later games
+        Index('ix_crash_games_end_time_crash_point', 'end_time',
+              postgresql_include=['crash_point', 'game_id']),
+        Index('ix_crash_games_game_id_covering', 'game_id',
+              postgresql_include=['end_time', 'crash_point']),
     )
 
     def to_dict(self):
         """Convert model instance to dictionary with ISO formatted datetime strings."""
+        return CrashGame.values_to_dict({
+            attr.key: getattr(self, attr.key) for attr in self.__mapper__.column_attrs
+        })
+
+    @staticmethod
+    def values_to_dict(values: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Convert game values keyed by attribute name to the to_dict() format.
+
+        Args:
+            values: Mapping of CrashGame attribute names to values, such as
+                the mapping of a result row with labeled columns
+
+        Returns:
+            Dictionary with ISO formatted datetime strings
+        """
         return {
-            'gameId': self.gameId,
-            'hashValue': self.hashValue,
-            'crashPoint': float(self.crashPoint) if self.crashPoint is not None else None,
-            'calculatedPoint': float(self.calculatedPoint) if self.calculatedPoint is not None else None,
-            'crashedFloor': int(self.crashedFloor) if self.crashedFloor is not None else None,
-            'endTime': self.endTime.isoformat() if self.endTime is not None else None,
-            'prepareTime': self.prepareTime.isoformat() if self.prepareTime is not None else None,
-            'beginTime': self.beginTime.isoformat() if self.beginTime is not None else None
+            'gameId': values['gameId'],
+            'hashValue': values['hashValue'],
+            'crashPoint': float(values['crashPoint']) if values['crashPoint'] is not None else None,
+            'calculatedPoint': float(values['calculatedPoint']) if values['calculatedPoint'] is not None else None,
+            'crashedFloor': int(values['crashedFloor']) if values['crashedFloor'] is not None else None,
+            'endTime': values['endTime'].isoformat() if values['endTime'] is not None else None,
+            'prepareTime': values['prepareTime'].isoformat() if values['prepareTime'] is not None else None,
+            'beginTime': values['beginTime'].isoformat() if values['beginTime'] is not None else None
         }
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.db.models import Base, CrashGame
+
+
+@pytest.fixture
+def session():
+    """Provide a session bound to an empty in-memory SQLite database."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    db_session = sessionmaker(bind=engine)()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def add_games(session):
+    """
+    Return a helper that stores one game per ID.
+
+    Games end ten seconds apart unless explicit (naive UTC) end times are given.
+    """
+    def _add_games(game_ids, crash_points, end_times=None):
+        if end_times is None:
+            start = datetime(2026, 1, 1)
+            end_times = [start + timedelta(seconds=10 * (i + 1))
+                         for i in range(len(crash_points))]
+        for game_id, crash_point, end_time in zip(game_ids, crash_points, end_times):
+            session.add(CrashGame(
+                gameId=str(game_id),
+                hashValue=f'hash-{game_id}',
+                crashPoint=crash_point,
+                calculatedPoint=crash_point,
+                crashedFloor=int(crash_point),
+                endTime=end_time,
+            ))
+        session.commit()
+    return _add_games
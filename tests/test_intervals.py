@@ -0,0 +1,219 @@
+"""
+Tests for the interval analytics functions.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.api.analytics import intervals as intervals_module
+from src.api.analytics.intervals import (
+    get_min_crash_point_intervals_by_date_range,
+    get_min_crash_point_intervals_by_date_range_batch,
+    get_min_crash_point_intervals_by_game_sets,
+    get_min_crash_point_intervals_by_game_sets_batch,
+    get_min_crash_point_intervals_by_time,
+    get_min_crash_point_intervals_by_time_batch,
+)
+
+NOW = datetime(2026, 1, 1, 12, 34, 56, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() always returns NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW.astimezone(tz) if tz else NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze the current time seen by the interval functions at NOW."""
+    monkeypatch.setattr(intervals_module, 'datetime', _FrozenDatetime)
+
+
+def _crash_points(count):
+    """Return a repeating pattern of crash points."""
+    pattern = [1.0, 1.5, 2.0, 3.5, 10.0]
+    return [pattern[i % len(pattern)] for i in range(count)]
+
+
+def _add_timed_games(add_games, games):
+    """Store (end_time, crash_point) pairs with sequential game IDs."""
+    end_times, crash_points = zip(*games)
+    add_games(range(1000, 1000 + len(games)), crash_points, end_times)
+
+
+def _summary(intervals):
+    """Reduce interval dictionaries to (interval_start, count, total_games, percentage)."""
+    return [(i['interval_start'], i['count'], i['total_games'], i['percentage'])
+            for i in intervals]
+
+
+def test_date_range_batch_with_unsorted_and_duplicate_values(session, add_games):
+    _add_timed_games(add_games, [
+        (datetime(2026, 1, 1, 0, 1), 1.0),
+        (datetime(2026, 1, 1, 0, 2), 2.0),
+        (datetime(2026, 1, 1, 0, 3), 3.5),
+        (datetime(2026, 1, 1, 0, 12), 1.5),
+        (datetime(2026, 1, 1, 0, 15), 5.0),
+    ])
+    start = datetime(2026, 1, 1)
+    values = [3.0, 1.5, 3.0, 2.0]
+
+    result = get_min_crash_point_intervals_by_date_range_batch(
+        session, values, start, start, interval_minutes=10)
+
+    first, second = start, start + timedelta(minutes=10)
+    assert set(result) == {'3.0', '1.5', '2.0'}
+    assert _summary(result['3.0']) == [
+        (first, 1, 3, 1 / 3 * 100), (second, 1, 2, 50.0)]
+    assert _summary(result['1.5']) == [
+        (first, 2, 3, 2 / 3 * 100), (second, 2, 2, 100.0)]
+    assert _summary(result['2.0']) == [
+        (first, 2, 3, 2 / 3 * 100), (second, 1, 2, 50.0)]
+    for value in values:
+        assert result[str(value)] == get_min_crash_point_intervals_by_date_range(
+            session, value, start, start, interval_minutes=10)
+
+
+def test_date_range_places_games_on_interval_edges(session, add_games):
+    _add_timed_games(add_games, [
+        (datetime(2026, 1, 1, 0, 9, 59, 999999), 2.0),
+        (datetime(2026, 1, 1, 0, 10), 1.0),
+        (datetime(2026, 1, 1, 0, 20), 3.0),
+        (datetime(2026, 1, 1, 23, 59, 59, 999999), 2.5),
+        (datetime(2026, 1, 2), 2.5),
+    ])
+    start = datetime(2026, 1, 1)
+
+    intervals = get_min_crash_point_intervals_by_date_range(
+        session, 2.0, start, start, interval_minutes=10)
+
+    # The last game of the day is counted, the first game of the next is not
+    assert _summary(intervals) == [
+        (datetime(2026, 1, 1, 0, 0), 1, 1, 100.0),
+        (datetime(2026, 1, 1, 0, 10), 0, 1, 0.0),
+        (datetime(2026, 1, 1, 0, 20), 1, 1, 100.0),
+        (datetime(2026, 1, 1, 23, 50), 1, 1, 100.0),
+    ]
+
+
+def test_time_excludes_games_at_the_analysis_end_time(session, add_games, frozen_now):
+    naive_now = NOW.replace(tzinfo=None)
+    _add_timed_games(add_games, [
+        (datetime(2026, 1, 1, 11, 29, 59), 5.0),
+        (datetime(2026, 1, 1, 11, 30), 2.0),
+        (datetime(2026, 1, 1, 11, 45), 1.2),
+        (naive_now - timedelta(microseconds=1), 1.0),
+        (naive_now, 4.0),
+    ])
+
+    intervals = get_min_crash_point_intervals_by_time(
+        session, 2.0, interval_minutes=15, hours=1)
+    batch = get_min_crash_point_intervals_by_time_batch(
+        session, [2.0, 1.0], interval_minutes=15, hours=1)
+
+    # The window starts one hour before the last 15 minute boundary (12:30)
+    assert _summary(intervals) == [
+        (datetime(2026, 1, 1, 11, 30, tzinfo=timezone.utc), 1, 1, 100.0),
+        (datetime(2026, 1, 1, 11, 45, tzinfo=timezone.utc), 0, 1, 0.0),
+        (datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc), 0, 1, 0.0),
+    ]
+    assert batch['2.0'] == intervals
+    assert [i['count'] for i in batch['1.0']] == [1, 1, 1]
+
+
+def test_date_range_skips_empty_leading_and_trailing_intervals(session, add_games):
+    _add_timed_games(add_games, [
+        (datetime(2026, 1, 1, 12, 3), 2.0),
+        (datetime(2026, 1, 1, 12, 7), 1.5),
+        (datetime(2026, 1, 1, 12, 25), 1.0),
+    ])
+    start = datetime(2026, 1, 1)
+
+    intervals = get_min_crash_point_intervals_by_date_range(
+        session, 1.5, start, start, interval_minutes=10)
+
+    assert _summary(intervals) == [
+        (datetime(2026, 1, 1, 12, 0), 2, 2, 100.0),
+        (datetime(2026, 1, 1, 12, 20), 0, 1, 0.0),
+    ]
+
+
+def test_date_range_with_naive_and_aware_start_dates(session, add_games):
+    _add_timed_games(add_games, [
+        (datetime(2026, 1, 1, 0, 5), 2.0),
+        (datetime(2026, 1, 1, 18, 35), 1.0),
+    ])
+    naive_start = datetime(2026, 1, 1)
+    utc_start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    ist = timezone(timedelta(hours=5, minutes=30))
+    ist_start = datetime(2026, 1, 1, tzinfo=ist)
+
+    naive = get_min_crash_point_intervals_by_date_range(
+        session, 2.0, naive_start, naive_start, interval_minutes=10)
+    utc = get_min_crash_point_intervals_by_date_range(
+        session, 2.0, utc_start, utc_start, interval_minutes=10)
+    local = get_min_crash_point_intervals_by_date_range(
+        session, 2.0, ist_start, ist_start, interval_minutes=10)
+
+    assert _summary(naive) == [
+        (datetime(2026, 1, 1, 0, 0), 1, 1, 100.0),
+        (datetime(2026, 1, 1, 18, 30), 0, 1, 0.0),
+    ]
+    assert _summary(utc) == [
+        (datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc), 1, 1, 100.0),
+        (datetime(2026, 1, 1, 18, 30, tzinfo=timezone.utc), 0, 1, 0.0),
+    ]
+    # The local day runs from 18:30 UTC the day before, so the evening game
+    # falls on the next local day
+    assert _summary(local) == [
+        (datetime(2026, 1, 1, 5, 30, tzinfo=ist), 1, 1, 100.0),
+    ]
+
+
+def test_game_sets_group_recent_games(session, add_games):
+    game_ids = range(1000, 1035)
+    add_games(game_ids, _crash_points(len(game_ids)))
+
+    intervals = get_min_crash_point_intervals_by_game_sets(
+        session, 2.0, games_per_set=10, total_games=1000)
+
+    assert [i['start_game'] for i in intervals] == [1030, 1020, 1010, 1000]
+    assert intervals[0]['is_current_interval']
+    assert intervals[0]['actual_games'] == 5
+    assert intervals[0]['count'] == 3
+    assert [i['count'] for i in intervals[1:]] == [6, 6, 6]
+
+
+def test_game_sets_with_ids_crossing_a_power_of_ten(session, add_games):
+    # Game IDs are strings, so 999999 sorts above 1000000 and the fetched
+    # range has no sets between its highest and lowest game
+    game_ids = range(999990, 1000020)
+    add_games(game_ids, _crash_points(len(game_ids)))
+
+    assert get_min_crash_point_intervals_by_game_sets(
+        session, 2.0, games_per_set=10, total_games=15) == []
+    assert get_min_crash_point_intervals_by_game_sets(
+        session, 2.0, games_per_set=25, total_games=1000) == []
+
+
+@pytest.mark.parametrize('game_ids', [
+    range(1000, 1137),
+    range(999990, 1000020),
+])
+@pytest.mark.parametrize('games_per_set', [10, 25, 50])
+@pytest.mark.parametrize('total_games', [15, 1000])
+def test_game_sets_batch_matches_single_value(
+        session, add_games, game_ids, games_per_set, total_games):
+    add_games(game_ids, _crash_points(len(game_ids)))
+    values = [1.5, 2.0, 10.0]
+
+    batch = get_min_crash_point_intervals_by_game_sets_batch(
+        session, values, games_per_set, total_games)
+
+    for value in values:
+        assert batch[str(value)] == get_min_crash_point_intervals_by_game_sets(
+            session, value, games_per_set, total_games)
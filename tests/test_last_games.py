@@ -0,0 +1,103 @@
+"""
+Tests for the last games analytics functions.
+"""
+
+import pytest
+
+from src.api.analytics.last_games import (
+    calculate_crash_probability,
+    calculate_max_crash_probability,
+    get_last_game_exact_floor,
+    get_last_game_max_crash_point,
+    get_last_game_min_crash_point,
+    get_last_games_exact_floors,
+    get_last_games_max_crash_points,
+    get_last_games_min_crash_points,
+    get_last_min_crash_point_games,
+)
+from src.db.models import CrashGame
+
+
+CRASH_POINTS = [1.0, 5.0, 1.2, 3.0, 1.1, 2.0, 1.3, 1.05, 2.5, 1.4]
+
+
+@pytest.fixture
+def games(add_games):
+    """Store ten games, 1000 to 1009, with CRASH_POINTS in order."""
+    add_games(range(1000, 1010), CRASH_POINTS)
+
+
+def test_last_games_match_model_to_dict(session, games):
+
+    games = get_last_min_crash_point_games(session, 2.0, limit=3)
+
+    expected = [session.get(CrashGame, game_id).to_dict()
+                for game_id in ('1008', '1005', '1003')]
+    assert games == expected
+
+
+def test_last_game_reports_games_since(session, games):
+
+    game, games_since = get_last_game_min_crash_point(session, 3.0)
+
+    assert game['gameId'] == '1003'
+    assert game['crashPoint'] == 3.0
+    assert games_since == 6
+
+
+def _found(results):
+    """Map each value with a match to its (gameId, games_since)."""
+    return {value: (match[0]['gameId'], match[1])
+            for value, match in results.items() if match}
+
+
+@pytest.mark.parametrize('get_batch, get_single, values', [
+    (get_last_games_min_crash_points, get_last_game_min_crash_point,
+     [3.0, 6.0, 1.5, 5.0, 3.0]),
+    (get_last_games_max_crash_points, get_last_game_max_crash_point,
+     [1.2, 0.5, 1.4, 1.0, 1.2]),
+    (get_last_games_exact_floors, get_last_game_exact_floor,
+     [2, 7, 1, 5, 2]),
+])
+def test_batch_lookups_match_single_lookups(session, games, get_batch, get_single, values):
+    results = get_batch(session, values)
+
+    assert set(results) == set(values)
+    for value in values:
+        assert results[value] == get_single(session, value)
+
+
+def test_min_crash_point_batch_results(session, games):
+    results = get_last_games_min_crash_points(session, [5.0, 6.0, 1.5, 3.0])
+
+    assert results[6.0] is None
+    assert _found(results) == {
+        5.0: ('1001', 8), 1.5: ('1008', 1), 3.0: ('1003', 6)}
+    assert results[3.0][0]['probability'] == {
+        'value': calculate_crash_probability(3.0, 6), 'games_since': 6}
+
+
+def test_max_crash_point_batch_results(session, games):
+    results = get_last_games_max_crash_points(session, [1.0, 0.5, 1.4, 1.2])
+
+    assert results[0.5] is None
+    assert _found(results) == {
+        1.0: ('1000', 9), 1.4: ('1009', 0), 1.2: ('1007', 2)}
+    assert results[1.2][0]['probability'] == {
+        'value': calculate_max_crash_probability(1.2, 2), 'games_since': 2}
+
+
+def test_exact_floor_batch_results(session, games):
+    results = get_last_games_exact_floors(session, [3, 7, 1, 2])
+
+    assert results[7] is None
+    assert _found(results) == {
+        3: ('1003', 6), 1: ('1009', 0), 2: ('1008', 1)}
+    assert all('probability' not in game
+               for game, _ in filter(None, results.values()))
+
+
+def test_batch_lookups_with_no_values(session, games):
+    assert get_last_games_min_crash_points(session, []) == {}
+    assert get_last_games_max_crash_points(session, []) == {}
+    assert get_last_games_exact_floors(session, []) == {}